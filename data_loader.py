@@ -7,11 +7,12 @@ needed for the modular data explorer.
 """
 
 import json
+import base64
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import argparse
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Optional, Union
 import logging
 
 # Setup logging
@@ -21,6 +22,47 @@ logger = logging.getLogger(__name__)
 class DataExplorerConfig:
     """Configuration generator for the Data Explorer"""
     
+    # String columns with more distinct values than this get no first-paint summary
+    max_summary_categories = 1000
+    
+    # Compass sectors of an angle column's polar bins
+    angle_sectors = 36
+    
+    # Name fragments that mark a 0-360 numeric column as an angle in degrees
+    angle_name_hints = ("angle", "direction", "heading", "bearing", "azimuth", "deg")
+    
+    # Quantile intervals stored per histogram bin for the page's percentiles
+    quantile_points = 16
+    
+    # Rows per chunk when accumulating correlation moment sums
+    correlation_chunk_rows = 65536
+    
+    # String columns with more values than this are not charted by the page
+    max_chart_categories = 100
+    
+    # Largest number of non-empty cells an aggregate cube may embed
+    cube_max_cells = 1_000_000
+    
+    # String columns with more values than this keep only their most frequent
+    # ones plus a single "Other" value
+    top_k_values = 20
+    other_label = "Other"
+    
+    # Folded columns are only charted when their top values hold this share of rows
+    top_k_min_share = 0.25
+    
+    # String columns with at most this many values get per-value bitmaps
+    bitmap_max_values = 64
+    
+    # Buckets in the coarsest and finest levels of a line chart's pyramid
+    pyramid_min_buckets = 256
+    pyramid_max_buckets = 65536
+    
+    # Square sizes of a scatter plot's embedded density rasters, and the most
+    # cells per point a level may have
+    raster_sizes = (256, 512, 1024)
+    raster_cells_per_point = 4
+    
     def __init__(self):
         self.config = {
             "title": "Generic Data Explorer",
@@ -30,6 +72,9 @@ class DataExplorerConfig:
             "chartTypes": [],
             "miniMetrics": []
         }
+        self.encode_columns = True
+        self.cube_mode = False
+        self.bitmap_indexes = True
     
     def load_csv(self, file_path: str, **kwargs) -> 'DataExplorerConfig':
         """Load data from CSV file"""
@@ -46,12 +91,19 @@ class DataExplorerConfig:
         """Load data from pandas DataFrame"""
         logger.info(f"Loading DataFrame with {len(df)} rows and {len(df.columns)} columns")
         
+        # Degree strings such as "134°" are read as their numbers
+        df, degree_columns = self._parse_degree_strings(df)
+        
+        # Infer column types
+        self.config["columnTypes"] = self._infer_column_types(df, degree_columns)
+        
         # Convert DataFrame to list of dictionaries
         self.config["data"] = df.to_dict('records')
         self.config["columns"] = df.columns.tolist()
         
-        # Infer column types
-        self.config["columnTypes"] = self._infer_column_types(df)
+        # Charts and filters see the long tails of high-cardinality string
+        # columns folded into "Other"; the rows keep their own values
+        df = self._collapse_long_tails(df)
         
         # Generate default chart configurations
         self.config["chartTypes"] = self._generate_chart_configs(df)
@@ -59,6 +111,9 @@ class DataExplorerConfig:
         # Generate mini metrics
         self.config["miniMetrics"] = self._generate_mini_metrics(df)
         
+        # Precompute unfiltered histograms for the first paint
+        self.config["summaries"] = self._generate_summaries(df)
+        
         return self
     
     def load_json(self, file_path: str) -> 'DataExplorerConfig':
@@ -99,7 +154,7 @@ class DataExplorerConfig:
             logger.error(f"Error loading JSON: {e}")
             raise
     
-    def _infer_column_types(self, df: pd.DataFrame) -> Dict[str, str]:
+    def _infer_column_types(self, df: pd.DataFrame, degree_columns: List[str] = ()) -> Dict[str, str]:
         """Infer column types from DataFrame"""
         column_types = {}
         
@@ -107,7 +162,9 @@ class DataExplorerConfig:
             dtype = df[col].dtype
             
             if pd.api.types.is_numeric_dtype(dtype):
-                if pd.api.types.is_integer_dtype(dtype):
+                if self._is_angle_column(col, df[col], col in degree_columns):
+                    column_types[col] = "angle"
+                elif pd.api.types.is_integer_dtype(dtype):
                     column_types[col] = "integer"
                 else:
                     column_types[col] = "number"
@@ -124,6 +181,45 @@ class DataExplorerConfig:
         
         return column_types
     
+    def _collapse_long_tails(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Pick the top_k_values most frequent values of each string column and fold the rest into other_label"""
+        self.config["otherValues"] = {}
+        self.config["foldedValues"] = {}
+        if not self.top_k_values:
+            return df
+        
+        for col in df.columns:
+            if self.config["columnTypes"].get(col) != "string":
+                continue
+            codes, uniques = self._factorize(df[col])
+            if len(uniques) <= self.top_k_values:
+                continue
+            
+            # Exact counts, heaviest first with ties in order of first appearance
+            counts = np.bincount(codes, minlength=len(uniques))
+            keep = np.zeros(len(uniques), dtype=bool)
+            keep[np.argsort(-counts, kind='stable')[:self.top_k_values]] = True
+            
+            label = self.other_label
+            while label in set(uniques.tolist()):
+                label = f"({label})"
+            self.config["otherValues"][col] = label
+            self.config["foldedValues"][col] = uniques[keep].tolist()
+            logger.info(f"Folded {len(uniques) - self.top_k_values:,} values of {col} into {label!r}")
+        
+        return self._fold_long_tails(df)
+    
+    def _fold_long_tails(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Copy of the rows with each folded column's values outside its top values replaced by its "Other" label"""
+        folded = self.config.get("foldedValues", {})
+        if not folded:
+            return df
+        
+        df = df.copy()
+        for col, values in folded.items():
+            df[col] = df[col].where(df[col].isin(values), self.config["otherValues"][col])
+        return df
+    
     def _is_time_column(self, series: pd.Series) -> bool:
         """Check if a column contains time-like data"""
         if len(series) == 0:
@@ -148,6 +244,34 @@ class DataExplorerConfig:
         
         return False
     
+    def _parse_degree_strings(self, df: pd.DataFrame):
+        """Replace string columns whose every value is a number followed by ° with those numbers, and name them"""
+        parsed = {}
+        for col in df.columns:
+            if not pd.api.types.is_object_dtype(df[col].dtype) and not pd.api.types.is_string_dtype(df[col].dtype):
+                continue
+            values = df[col].dropna().astype(str).str.strip()
+            if values.empty or not values.str.endswith("°").all():
+                continue
+            numbers = pd.to_numeric(values.str[:-1], errors="coerce")
+            if numbers.isna().any():
+                continue
+            parsed[col] = numbers.reindex(df.index)
+        
+        return (df.assign(**parsed) if parsed else df), list(parsed)
+    
+    def _is_angle_column(self, col: str, series: pd.Series, degrees: bool = False) -> bool:
+        """Check if a numeric column holds angles in degrees"""
+        # Angles wrap around, so the range alone cannot tell them from scores
+        # or counts; a ° suffix or the column name has to say so
+        if not degrees and not any(hint in str(col).lower() for hint in self.angle_name_hints):
+            return False
+        
+        values = series.dropna()
+        if values.nunique() <= 20 or values.min() < 0 or values.max() > 360:
+            return False
+        return values.max() - values.min() >= 180
+    
     def _generate_chart_configs(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Generate chart configurations based on data types"""
         chart_configs = []
@@ -169,10 +293,21 @@ class DataExplorerConfig:
                     "column": col,
                     "title": f"{col} Distribution"
                 })
+            elif col_type == "angle":
+                # Polar chart for directions
+                chart_configs.append({
+                    "type": "angle",
+                    "column": col,
+                    "title": f"{col} Distribution"
+                })
             elif col_type == "string":
                 # Categorical chart for string data
                 unique_count = df[col].nunique()
-                if unique_count <= 20:  # Only show categorical for reasonable number of categories
+                # Only show categorical for reasonable number of categories, or
+                # for heavy hitters that leave "Other" a minority of the rows
+                other = self.config.get("otherValues", {}).get(col)
+                heavy = other is not None and (df[col] != other).mean() >= self.top_k_min_share
+                if unique_count <= 20 or heavy:
                     chart_configs.append({
                         "type": "categorical",
                         "column": col,
@@ -182,6 +317,389 @@ class DataExplorerConfig:
         # Limit to 6 charts for grid layout
         return chart_configs[:6]
     
+    def _generate_summaries(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Precompute unfiltered histograms and stats so the page can paint before decoding rows"""
+        summaries = {}
+        
+        for col in df.columns:
+            col_type = self.config["columnTypes"].get(col, "string")
+            
+            if col_type == "angle":
+                summaries[col] = self._summarize_angle(df[col])
+            elif col_type in ["number", "integer", "time"]:
+                summaries[col] = self._summarize_numeric(df[col], col_type, self._num_bins(col_type))
+            elif df[col].nunique(dropna=False) <= self.max_summary_categories:
+                summaries[col] = self._summarize_categorical(df[col])
+        
+        return summaries
+    
+    def _num_bins(self, col_type: str) -> int:
+        """Same bin counts the page uses in prebinData"""
+        if col_type == "angle":
+            return self.angle_sectors
+        return 24 if col_type == "time" else 50
+    
+    def _page_values(self, series: pd.Series, col_type: str) -> np.ndarray:
+        """A numeric column as float64 copies of the values the page holds"""
+        # The page holds these columns as Int32Array/Float32Array
+        if col_type == "time":
+            values = self._time_to_seconds(series).to_numpy(dtype=np.float64).astype(np.float32)
+        elif col_type == "integer":
+            values = series.to_numpy().astype(np.int32)
+        else:
+            values = series.to_numpy(dtype=np.float64).astype(np.float32)
+        return values.astype(np.float64)
+    
+    def _bin_ids(self, series: pd.Series, col_type: str, num_bins: int):
+        """Per-row bin ids as the page computes them, -1 for rows without a value"""
+        values = self._page_values(series, col_type)
+        
+        if col_type == "angle":
+            # Sectors of the fixed 0-360 circle; 360 wraps to the first sector
+            ids = np.full(len(values), -1, dtype=np.int64)
+            valid = ~np.isnan(values)
+            ids[valid] = np.floor(np.mod(values[valid], 360.0) / (360.0 / num_bins)).astype(np.int64) % num_bins
+            return values, ids, 0.0, 360.0
+        
+        valid = ~np.isnan(values)
+        min_val = float(values[valid].min()) if valid.any() else 0.0
+        max_val = float(values[valid].max()) if valid.any() else 0.0
+        bin_size = (max_val - min_val) / num_bins
+        
+        # With a zero bin size the page puts every row with a value in the first bin
+        ids = np.full(len(values), -1, dtype=np.int64)
+        ids[valid] = 0
+        if bin_size > 0:
+            ids[valid] = np.minimum(np.floor((values[valid] - min_val) / bin_size), num_bins - 1)
+        return values, ids, min_val, max_val
+    
+    def _summarize_numeric(self, series: pd.Series, col_type: str, num_bins: int) -> Dict[str, Any]:
+        """Histogram and moments of a numeric column, binned exactly as the page bins it"""
+        values, ids, min_val, max_val = self._bin_ids(series, col_type, num_bins)
+        binned = values[ids >= 0]
+        counts = np.bincount(ids[ids >= 0], minlength=num_bins)
+        
+        return {
+            "min": min_val,
+            "max": max_val,
+            "counts": counts.tolist(),
+            "quantiles": self._bin_quantiles(binned, counts).tolist(),
+            "stats": {
+                "count": int(len(binned)),
+                "sum": float(binned.sum()),
+                "min": min_val,
+                "max": max_val,
+                "sumSq": float((binned * binned).sum())
+            }
+        }
+    
+    def _summarize_angle(self, series: pd.Series) -> Dict[str, Any]:
+        """Counts per compass sector, binned exactly as the page bins angles"""
+        values, ids, min_val, max_val = self._bin_ids(series, "angle", self.angle_sectors)
+        binned = values[ids >= 0]
+        counts = np.bincount(ids[ids >= 0], minlength=self.angle_sectors)
+        
+        return {
+            "min": min_val,
+            "max": max_val,
+            "counts": counts.tolist(),
+            "stats": {
+                "count": int(len(binned)),
+                "sum": float(binned.sum()),
+                "min": float(binned.min()) if len(binned) else 0.0,
+                "max": float(binned.max()) if len(binned) else 0.0,
+                "sumSq": float((binned * binned).sum())
+            }
+        }
+    
+    def _bin_quantiles(self, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Evenly spaced quantiles of the values in each bin, flattened bin by bin"""
+        # Bins are value ranges, so each bin is a contiguous run of the sorted values
+        sorted_values = np.sort(values)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        steps = np.arange(self.quantile_points + 1) / self.quantile_points
+        
+        # Same rank rounding as the page's Math.round; empty bins are never read
+        offsets = np.floor(steps[None, :] * np.maximum(counts - 1, 0)[:, None] + 0.5).astype(np.int64)
+        index = np.minimum(starts[:, None] + offsets, max(len(sorted_values) - 1, 0))
+        quantiles = sorted_values[index] if len(sorted_values) else np.zeros(index.shape)
+        return np.where(counts[:, None] > 0, quantiles, 0.0).ravel()
+    
+    def _generate_grid_summaries(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Precompute the unfiltered grid of every heatmap and category cube, keyed "x|y" as on the page"""
+        summaries = {}
+        
+        for chart in self.config["chartTypes"]:
+            if chart.get("type") == "heatmap":
+                x, y = chart["column"], chart["y"]
+            elif chart.get("type") == "multiples":
+                # A category cube: dictionary code x histogram bin of the column
+                x, y = chart["by"], chart["column"]
+            elif chart.get("type") == "angle" and chart.get("magnitude"):
+                # Polar bins: compass sector x magnitude ring
+                x, y = chart["column"], chart["magnitude"]
+            else:
+                continue
+            
+            # The grid is dense over dictionary codes; the page does not chart
+            # a string axis this wide, so there is nothing to embed it for
+            wide = [col for col in (x, y) if self.config["columnTypes"].get(col, "string") == "string"
+                    and df[col].nunique(dropna=False) > self.max_chart_categories]
+            if wide:
+                logger.info(f"Skipping the {x}|{y} grid: {wide[0]} has more than {self.max_chart_categories} values")
+                continue
+            summaries[f"{x}|{y}"] = self._summarize_grid(df, x, y)
+        
+        return summaries
+    
+    def _axis_ids(self, df: pd.DataFrame, col: str):
+        """Per-row bin ids of a column as the page bins it, dictionary codes for strings"""
+        col_type = self.config["columnTypes"].get(col, "number")
+        if col_type == "string":
+            codes, uniques = self._factorize(df[col])
+            return codes.astype(np.int64), len(uniques)
+        num_bins = self._num_bins(col_type)
+        return self._bin_ids(df[col], col_type, num_bins)[1], num_bins
+    
+    def _summarize_grid(self, df: pd.DataFrame, x: str, y: str) -> Dict[str, Any]:
+        """2D counts over the cells formed by the two columns' histogram bins or dictionary codes"""
+        (x_ids, nx), (y_ids, ny) = self._axis_ids(df, x), self._axis_ids(df, y)
+        
+        # Cells are laid out x-major, as the page indexes them
+        both = (x_ids >= 0) & (y_ids >= 0)
+        counts = np.bincount(x_ids[both] * ny + y_ids[both], minlength=nx * ny)
+        return {"counts": counts.tolist()}
+    
+    def _cube_dimensions(self) -> List[str]:
+        """Every column the charts bin, in chart order"""
+        dimensions = []
+        for chart in self.config["chartTypes"]:
+            if chart.get("type") == "heatmap":
+                columns = [chart["column"], chart["y"]]
+            elif chart.get("type") == "multiples":
+                columns = [chart["by"], chart["column"]]
+            elif chart.get("type") == "angle":
+                columns = [chart["column"]] + ([chart["magnitude"]] if chart.get("magnitude") else [])
+            elif chart.get("type") in ("correlation", "line", "scatter"):
+                columns = []
+            else:
+                columns = [chart["column"]]
+            dimensions += [col for col in columns if col not in dimensions]
+        return dimensions
+    
+    def _compute_cube(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """Sparse row counts over the combinations of the charted bins that occur, or None past the size guard"""
+        dimensions = self._cube_dimensions()
+        axes = [self._axis_ids(df, col) for col in dimensions]
+        if not axes or any(n >= 0xFFFF for _, n in axes):
+            logger.info("Skipping the aggregate cube: a dimension has too many bins")
+            return None
+        
+        # Rows without a value get their own slot past the last bin
+        ids = np.stack([np.where(col_ids >= 0, col_ids, n) for col_ids, n in axes], axis=1)
+        cells, counts = np.unique(ids, axis=0, return_counts=True)
+        
+        # Summing cells only beats scanning rows when there are far fewer of them
+        if len(cells) > self.cube_max_cells or 2 * len(cells) > len(df):
+            logger.info(f"Skipping the aggregate cube: {len(cells):,} cells for {len(df):,} rows")
+            return None
+        
+        return {
+            "dimensions": dimensions,
+            "bins": [n for _, n in axes],
+            "cells": [
+                self._encode_array(cells[:, d].astype('<u1'), "u8") if n < 0x100
+                else self._encode_array(cells[:, d].astype('<u2'), "u16")
+                for d, (_, n) in enumerate(axes)
+            ],
+            "counts": self._encode_array(counts.astype('<i4'), "i32")
+        }
+    
+    def _compute_pyramid(self, df: pd.DataFrame, x: str, y: str) -> Dict[str, Any]:
+        """Min, max and mean of y over equal-width buckets of x, at levels four times finer each"""
+        xs = self._page_values(df[x], self.config["columnTypes"].get(x, "number"))
+        ys = self._page_values(df[y], self.config["columnTypes"].get(y, "number"))
+        valid = ~np.isnan(xs) & ~np.isnan(ys)
+        xs, ys = xs[valid], ys[valid]
+        min_val = float(xs.min()) if len(xs) else 0.0
+        max_val = float(xs.max()) if len(xs) else 0.0
+        
+        buckets = self.pyramid_min_buckets
+        while buckets < self.pyramid_max_buckets and buckets < len(xs):
+            buckets *= 4
+        
+        # Same bucket arithmetic as the page's TimePyramid.build
+        scale = buckets / (max_val - min_val) if max_val > min_val else 0.0
+        ids = np.minimum(np.floor((xs - min_val) * scale), buckets - 1).astype(np.int64)
+        counts = np.bincount(ids, minlength=buckets)
+        sums = np.bincount(ids, weights=ys, minlength=buckets)
+        lows = np.full(buckets, np.inf)
+        np.minimum.at(lows, ids, ys)
+        highs = np.full(buckets, -np.inf)
+        np.maximum.at(highs, ids, ys)
+        
+        levels = []
+        while True:
+            # Empty buckets hold NaN, as on the page
+            empty = counts == 0
+            means = sums / np.maximum(counts, 1)
+            levels.insert(0, {
+                "buckets": buckets,
+                "count": self._encode_array(counts.astype('<i4'), "i32"),
+                "min": self._encode_array(np.where(empty, np.nan, lows).astype('<f4'), "f32"),
+                "max": self._encode_array(np.where(empty, np.nan, highs).astype('<f4'), "f32"),
+                "mean": self._encode_array(np.where(empty, np.nan, means).astype('<f4'), "f32")
+            })
+            if buckets <= self.pyramid_min_buckets:
+                break
+            # Each coarser bucket covers four neighbouring finer ones
+            buckets //= 4
+            counts = counts.reshape(buckets, 4).sum(axis=1)
+            sums = sums.reshape(buckets, 4).sum(axis=1)
+            lows = lows.reshape(buckets, 4).min(axis=1)
+            highs = highs.reshape(buckets, 4).max(axis=1)
+        
+        return {"min": min_val, "max": max_val, "levels": levels}
+    
+    def _compute_rasters(self, df: pd.DataFrame, x: str, y: str) -> Dict[str, Any]:
+        """Point counts of an x/y pair over square rasters of the full extent, bottom row first"""
+        xs = self._page_values(df[x], self.config["columnTypes"].get(x, "number"))
+        ys = self._page_values(df[y], self.config["columnTypes"].get(y, "number"))
+        valid = ~np.isnan(xs) & ~np.isnan(ys)
+        xs, ys = xs[valid], ys[valid]
+        
+        extent = []
+        for values in (xs, ys):
+            extent.append([float(values.min()), float(values.max())] if len(values) else [0.0, 0.0])
+        
+        # The page upsamples the finest raster, so a level is kept until it has
+        # more than raster_cells_per_point cells per point, most of them empty
+        sizes = ([size for size in self.raster_sizes if size * size <= self.raster_cells_per_point * len(xs)]
+                 or [min(self.raster_sizes)])
+        
+        levels = []
+        for size in sizes:
+            cells = []
+            for values, (lo, hi) in zip((xs, ys), extent):
+                scale = size / (hi - lo) if hi > lo else 0.0
+                cells.append(np.minimum(np.floor((values - lo) * scale), size - 1).astype(np.int64))
+            counts = np.bincount(cells[1] * size + cells[0], minlength=size * size)
+            
+            # Counts in the narrowest type; fine levels are mostly small counts
+            if counts.max() < 0x100:
+                encoded = self._encode_array(counts.astype('<u1'), "u8")
+            elif counts.max() < 0x10000:
+                encoded = self._encode_array(counts.astype('<u2'), "u16")
+            else:
+                encoded = self._encode_array(counts.astype('<i4'), "i32")
+            levels.append({"size": size, "counts": encoded})
+        
+        return {"x": extent[0], "y": extent[1], "levels": levels}
+    
+    def _compute_correlation(self, df: pd.DataFrame, columns: List[str]) -> Dict[str, Any]:
+        """Pearson and Spearman matrices over the rows where every column has a value"""
+        types = [self.config["columnTypes"].get(col, "number") for col in columns]
+        chunk_rows = self.correlation_chunk_rows
+        
+        # One column in memory at a time for the shifts and the complete-row mask
+        complete = np.ones(len(df), dtype=bool)
+        shift = np.zeros(len(columns))
+        for c, (col, col_type) in enumerate(zip(columns, types)):
+            values = self._page_values(df[col], col_type)
+            complete &= ~np.isnan(values)
+            shift[c] = np.nanmean(values) if (~np.isnan(values)).any() else 0.0
+        
+        def value_chunks():
+            # Shifting by the means keeps the sums of products well conditioned
+            for start in range(0, len(df), chunk_rows):
+                rows = df.iloc[start:start + chunk_rows]
+                yield np.column_stack([self._page_values(rows[col], col_type)
+                                       for col, col_type in zip(columns, types)]) - shift
+        
+        count, sums, products = self._moment_sums(value_chunks(), len(columns))
+        
+        # Spearman is Pearson over the ranks among the complete rows; ranks are
+        # float64 since float32 cannot hold the .5 of tied ranks above 2**23 rows
+        ranks = []
+        for col, col_type in zip(columns, types):
+            rank = np.full(len(df), np.nan)
+            rank[complete] = pd.Series(self._page_values(df[col], col_type)[complete]).rank().to_numpy()
+            ranks.append(rank)
+        mean_rank = (count + 1) / 2
+        
+        def rank_chunks():
+            for start in range(0, len(df), chunk_rows):
+                yield np.column_stack([rank[start:start + chunk_rows] for rank in ranks]) - mean_rank
+        
+        rank_count, rank_sums, rank_products = self._moment_sums(rank_chunks(), len(columns))
+        
+        return {
+            "columns": list(columns),
+            "count": count,
+            "shift": shift.tolist(),
+            "sums": sums.tolist(),
+            "products": products.tolist(),
+            "pearson": self._pearson(count, sums, products),
+            "spearman": self._pearson(rank_count, rank_sums, rank_products)
+        }
+    
+    def _moment_sums(self, chunks, width: int):
+        """Count, sums and cross products of the complete rows, one matrix product per chunk"""
+        count = 0
+        sums = np.zeros(width)
+        products = np.zeros((width, width))
+        
+        for chunk in chunks:
+            chunk = chunk[~np.isnan(chunk).any(axis=1)]
+            count += len(chunk)
+            sums += chunk.sum(axis=0)
+            products += chunk.T @ chunk
+        
+        return count, sums, products
+    
+    def _pearson(self, count: int, sums: np.ndarray, products: np.ndarray) -> List[List[Any]]:
+        """Correlation matrix from moment sums, None where a column is constant"""
+        if count == 0:
+            return [[None] * len(sums) for _ in sums]
+        mean = sums / count
+        cov = products / count - np.outer(mean, mean)
+        scale = np.sqrt(np.maximum(np.diag(cov), 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.clip(cov / np.outer(scale, scale), -1, 1)
+        return [[float(v) if np.isfinite(v) else None for v in row] for row in r]
+    
+    def _factorize(self, series: pd.Series):
+        """Dictionary codes in order of first appearance, with missing values as one more value"""
+        # pd.factorize only keeps missing values itself (use_na_sentinel=False)
+        # from pandas 1.5, so they are slotted in where they first appear
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Index(uniques)
+        missing = codes < 0
+        if not missing.any():
+            return codes, uniques
+        first = int(np.argmax(missing))
+        code = int(codes[:first].max()) + 1 if first > 0 else 0
+        codes = np.where(codes >= code, codes + 1, codes)
+        codes[missing] = code
+        return codes, uniques.insert(code, getattr(series.dtype, 'na_value', np.nan))
+    
+    def _summarize_categorical(self, series: pd.Series) -> Dict[str, Any]:
+        """Value counts in order of first appearance, matching the page's dictionary codes"""
+        codes, uniques = self._factorize(series)
+        counts = np.bincount(codes, minlength=len(uniques))
+        return {
+            "values": pd.Index(uniques).tolist(),
+            "counts": counts.tolist()
+        }
+    
+    def _time_to_seconds(self, series: pd.Series) -> pd.Series:
+        """Convert HH:MM[:SS] strings to seconds since midnight, as the page does"""
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            return series.astype(float)
+        
+        parts = series.astype(str).str.extract(r'^(\d{1,2}):(\d{2})(?::(\d{2}))?(\.\d+)?$').astype(float)
+        return parts[0] * 3600 + parts[1] * 60 + parts[2].fillna(0) + parts[3].fillna(0)
+    
     def _generate_mini_metrics(self, df: pd.DataFrame) -> List[Dict[str, str]]:
         """Generate mini metrics configuration"""
         metrics = [
@@ -211,6 +729,74 @@ class DataExplorerConfig:
         self.config["chartTypes"].append(chart_config)
         return self
     
+    def add_heatmap(self, x: str, y: str, title: str = None) -> 'DataExplorerConfig':
+        """Add a 2D density chart of two numeric columns, brushed with a rectangle"""
+        return self.add_chart({
+            "type": "heatmap",
+            "column": x,
+            "y": y,
+            "title": title or f"{x} vs {y}"
+        })
+    
+    def add_small_multiples(self, column: str, by: str, title: str = None) -> 'DataExplorerConfig':
+        """Add one histogram of a numeric column per value of a string column"""
+        return self.add_chart({
+            "type": "multiples",
+            "column": column,
+            "by": by,
+            "title": title or f"{column} by {by}"
+        })
+    
+    def add_angle_chart(self, column: str, magnitude: str = None, title: str = None) -> 'DataExplorerConfig':
+        """Add a polar chart of an angle column, split into rings of a magnitude column when given"""
+        # Charting a column as angles marks it as one, so its filters wrap around
+        if self.config["columnTypes"].get(column) in ("number", "integer"):
+            self.config["columnTypes"][column] = "angle"
+            if "summaries" in self.config:
+                values = pd.Series([row[column] for row in self.config["data"]], dtype=np.float64)
+                self.config["summaries"][column] = self._summarize_angle(values)
+        chart = {"type": "angle", "column": column, "title": title or f"{column} Distribution"}
+        if magnitude:
+            chart["magnitude"] = magnitude
+        return self.add_chart(chart)
+    
+    def add_line_chart(self, x: str, y: str, title: str = None) -> 'DataExplorerConfig':
+        """Add a line chart of y over a time or numeric x, drawn from a downsampled pyramid"""
+        return self.add_chart({
+            "type": "line",
+            "column": x,
+            "y": y,
+            "title": title or f"{y} over {x}"
+        })
+    
+    def add_scatter(self, x: str, y: str, title: str = None, color_map: str = "log") -> 'DataExplorerConfig':
+        """Add a density-rasterized scatter plot; color_map is "log" or "eq" (histogram equalization)"""
+        return self.add_chart({
+            "type": "scatter",
+            "column": x,
+            "y": y,
+            "colorMap": color_map,
+            "title": title or f"{y} vs {x}"
+        })
+    
+    def add_correlation_matrix(self, columns: List[str] = None, title: str = "Correlation") -> 'DataExplorerConfig':
+        """Add a Pearson/Spearman matrix of numeric columns, all of them by default"""
+        # The page keeps the moment sums of a single matrix
+        if any(chart.get("type") == "correlation" for chart in self.config["chartTypes"]):
+            raise ValueError("Only one correlation matrix is supported")
+        if columns is None:
+            columns = [col for col, type_ in self.config["columnTypes"].items()
+                       if type_ in ["number", "integer"]]
+        invalid = [col for col in columns
+                   if self.config["columnTypes"].get(col, "string") == "string"]
+        if invalid:
+            raise ValueError(f"Correlation needs numeric columns, got: {', '.join(map(str, invalid))}")
+        return self.add_chart({
+            "type": "correlation",
+            "columns": columns,
+            "title": title
+        })
+    
     def set_chart_types(self, chart_types: List[Dict[str, Any]]) -> 'DataExplorerConfig':
         """Set custom chart types"""
         self.config["chartTypes"] = chart_types
@@ -221,6 +807,33 @@ class DataExplorerConfig:
         self.config["miniMetrics"] = metrics
         return self
     
+    def set_offscreen_rendering(self, enabled: bool = True) -> 'DataExplorerConfig':
+        """Draw chart panels in a worker via OffscreenCanvas when the browser supports it"""
+        self.config["offscreenCanvas"] = enabled
+        return self
+    
+    def set_column_encoding(self, enabled: bool = True) -> 'DataExplorerConfig':
+        """Embed columns as base64 typed arrays that the page decodes on first use, instead of row records"""
+        self.encode_columns = enabled
+        return self
+    
+    def set_cube_mode(self, enabled: bool = True, max_cells: int = None) -> 'DataExplorerConfig':
+        """Embed an aggregate cube of the charted bins so the page crossfilters by summing cells instead of scanning rows"""
+        self.cube_mode = enabled
+        if max_cells is not None:
+            self.cube_max_cells = max_cells
+        return self
+    
+    def set_bitmap_indexes(self, enabled: bool = True) -> 'DataExplorerConfig':
+        """Embed per-value row bitmaps of low-cardinality string columns for word-level categorical filtering"""
+        self.bitmap_indexes = enabled
+        return self
+    
+    def set_column_budget(self, megabytes: float) -> 'DataExplorerConfig':
+        """Memory budget for decoded columns in the page; least recently used columns are evicted beyond it"""
+        self.config["columnBudgetMB"] = megabytes
+        return self
+    
     def get_config(self) -> Dict[str, Any]:
         """Get the configuration dictionary"""
         return self.config.copy()
@@ -247,7 +860,7 @@ class DataExplorerConfig:
         # Embed the configuration
         config_script = f"""
         <script>
-            window.DataExplorerConfig = {json.dumps(self.config, indent=2)};
+            window.DataExplorerConfig = {json.dumps(self._page_config(), indent=2)};
         </script>
         """
         
@@ -257,987 +870,123 @@ class DataExplorerConfig:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
     
-    def _get_default_template(self) -> str:
-        """Get default HTML template"""
-        return """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Data Explorer</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body { font-family: -apple-system, sans-serif; background: #0a0a0a; color: #e0e0e0; overflow: hidden; }
-        #loading { position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); text-align: center; }
-        .progress { width: 400px; height: 6px; background: #333; margin-top: 10px; border-radius: 3px; }
-        .progress-bar { height: 100%; background: #4a9eff; transition: width 0.1s; border-radius: 3px; }
-        #main { display: none; height: 100vh; padding: 8px; }
-        .header { background: #1a1a1a; padding: 8px 16px; border-radius: 4px; display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px; }
-        .stats { display: flex; gap: 15px; font-size: 13px; }
-        .stats span { display: flex; align-items: center; gap: 5px; }
-        .stats strong { color: #4a9eff; }
-        button { background: #4a9eff; color: white; border: none; padding: 5px 10px; border-radius: 3px; cursor: pointer; font-size: 12px; transition: all 0.2s; }
-        button:hover { background: #3a8eef; }
-        button:active { transform: scale(0.95); }
-        .grid { display: grid; grid-template-columns: repeat(3, 1fr); grid-template-rows: repeat(2, 1fr); gap: 8px; height: calc(100% - 140px); }
-        .panel { background: #1a1a1a; border-radius: 4px; padding: 8px; position: relative; }
-        .panel-title { font-size: 13px; margin-bottom: 4px; font-weight: 500; }
-        canvas { position: absolute; top: 28px; left: 8px; right: 8px; bottom: 20px; cursor: crosshair; }
-        select { background: #333; color: #e0e0e0; border: 1px solid #555; padding: 3px 6px; border-radius: 3px; position: absolute; top: 4px; right: 8px; font-size: 11px; }
-        #tooltip { position: fixed; background: rgba(0,0,0,0.95); padding: 6px 10px; border-radius: 3px; font-size: 11px; pointer-events: none; display: none; z-index: 1000; border: 1px solid #333; }
-        .mini-mode { display: none; }
-        .mini-grid { display: grid; grid-template-columns: repeat(6, 1fr); gap: 8px; }
-        .mini-panel { background: #1a1a1a; border-radius: 4px; padding: 12px; text-align: center; }
-        .mini-value { font-size: 24px; font-weight: 600; color: #4a9eff; }
-        .mini-label { font-size: 11px; color: #999; margin-top: 4px; }
-        #statsPanel { position: absolute; top: 60px; right: 16px; background: rgba(26,26,26,0.95); border: 1px solid #333; border-radius: 4px; padding: 12px; font-size: 12px; display: none; z-index: 100; }
-        #statsPanel div { margin-bottom: 4px; }
-        #statsPanel strong { color: #4a9eff; margin-left: 4px; }
-        .range-display { 
-            background: #1a1a1a; 
-            padding: 12px 16px; 
-            border-radius: 4px; 
-            margin-bottom: 8px;
-            display: flex; 
-            gap: 24px; 
-            flex-wrap: wrap;
-        }
-        .mini-mode .range-display { display: none; }
-        .range-item { 
-            display: flex; 
-            flex-direction: column; 
-            min-width: 120px;
-        }
-        .range-label { 
-            font-size: 11px; 
-            color: #888; 
-            margin-bottom: 2px; 
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }
-        .range-value { 
-            font-size: 13px; 
-            color: #4a9eff; 
-            font-weight: 500;
-        }
-    </style>
-</head>
-<body>
-    <div id="loading">
-        <div>Loading data...</div>
-        <div class="progress"><div class="progress-bar" id="progress"></div></div>
-        <div id="loadingStatus" style="margin-top: 8px; font-size: 12px; color: #999;"></div>
-    </div>
-    
-    <div id="main">
-        <div class="header">
-            <h3 id="title">Data Explorer</h3>
-            <div class="stats">
-                <span>Total: <strong id="totalCount">0</strong></span>
-                <span>Filtered: <strong id="filteredCount">0</strong></span>
-                <span>Selected: <strong id="percentFiltered">0%</strong></span>
-            </div>
-            <div style="display: flex; gap: 8px;">
-                <button onclick="DataExplorer.toggleStats()">📊 Stats</button>
-                <button id="miniModeBtn" onclick="DataExplorer.toggleMiniMode()">📱 Mini</button>
-                <button onclick="DataExplorer.resetAll()">🔄 Reset</button>
-                <button onclick="DataExplorer.exportCSV()">💾 CSV</button>
-                <button onclick="DataExplorer.saveSnapshot()">📷 Snapshot</button>
-            </div>
-        </div>
-        
-        <div class="range-display" id="rangeDisplay"></div>
-        
-        <div class="grid" id="chartGrid"></div>
-        
-        <div class="mini-mode" id="miniMode">
-            <div class="mini-grid" id="miniGrid"></div>
-        </div>
-    </div>
-    
-    <div id="tooltip"></div>
-    <div id="statsPanel"></div>
-    
-    <script>
-        // ============================================================================
-        // DATA EXPLORER SYSTEM - EMBEDDED VERSION
-        // ============================================================================
-        
-        // Configuration object - will be populated by Python script
-        window.DataExplorerConfig = {
-            title: "Generic Data Explorer",
-            columns: [],
-            data: [],
-            columnTypes: {},
-            chartTypes: [],
-            miniMetrics: []
-        };
-        
-        // ============================================================================
-        // CORE DATA STRUCTURES
-        // ============================================================================
-        
-        let data = {};
-        let filteredIndices = null;
-        let currentRows = 0;
-        let binCache = {};
-        let charts = {};
-        let filters = {};
-        let isMiniMode = false;
-        
-        // ============================================================================
-        // UTILITY FUNCTIONS
-        // ============================================================================
-        
-        function formatCount(count) {
-            if (count >= 1000000) return (count / 1000000).toFixed(1) + 'M';
-            if (count >= 1000) return (count / 1000).toFixed(1) + 'K';
-            return count.toString();
-        }
+    def _page_config(self) -> Dict[str, Any]:
+        """Configuration as embedded in the page, with columns encoded when enabled"""
+        has_grids = "summaries" in self.config and any(
+            chart.get("type") in ("heatmap", "multiples") or (chart.get("type") == "angle" and chart.get("magnitude"))
+            for chart in self.config["chartTypes"])
+        matrix = next((chart for chart in self.config["chartTypes"] if chart.get("type") == "correlation"), None)
+        lines = [chart for chart in self.config["chartTypes"] if chart.get("type") == "line"]
+        scatters = [chart for chart in self.config["chartTypes"] if chart.get("type") == "scatter"]
+        if not self.config["data"] or not (self.encode_columns or has_grids or matrix or lines or scatters or
+                                           self.cube_mode or self.bitmap_indexes):
+            return self.config
         
-        function formatValue(value, type) {
-            if (type === 'time') {
-                const hours = Math.floor(value / 3600);
-                const minutes = Math.floor((value % 3600) / 60);
-                return `${hours.toString().padStart(2, '0')}:${minutes.toString().padStart(2, '0')}`;
-            }
-            if (type === 'number' || type === 'integer') {
-                return value.toLocaleString();
-            }
-            return value.toString();
-        }
-        
-        // ============================================================================
-        // DATA MANAGEMENT
-        // ============================================================================
-        
-        class DataManager {
-            static init(config) {
-                DataExplorerConfig = config;
-                document.getElementById('title').textContent = config.title;
-                
-                // Convert data to TypedArrays for performance
-                data = {};
-                currentRows = config.data.length;
-                
-                for (const col of config.columns) {
-                    const colType = config.columnTypes[col];
-                    const values = config.data.map(row => row[col]);
-                    
-                    if (colType === 'integer') {
-                        data[col] = new Int32Array(values);
-                    } else if (colType === 'number') {
-                        data[col] = new Float32Array(values);
-                    } else if (colType === 'time') {
-                        data[col] = new Float32Array(values);
-                    } else {
-                        data[col] = values; // Keep as array for strings
-                    }
-                }
-                
-                // Initialize filtered indices
-                filteredIndices = new Uint8Array(currentRows);
-                filteredIndices.fill(1);
-                
-                // Initialize filters
-                filters = {};
-                for (const col of config.columns) {
-                    filters[col] = null;
-                }
-                
-                // Pre-bin data for charts
-                this.prebinData();
-                
-                // Update UI
-                DataExplorer.updateStats();
-                DataExplorer.updateRanges();
-                DataExplorer.createChartGrid();
-                DataExplorer.createMiniGrid();
-                
-                // Hide loading, show main
-                document.getElementById('loading').style.display = 'none';
-                document.getElementById('main').style.display = 'block';
-            }
-            
-            static prebinData() {
-                binCache = {};
-                
-                for (const col of config.columns) {
-                    const colType = config.columnTypes[col];
-                    const values = data[col];
-                    
-                    if (colType === 'integer' || colType === 'number') {
-                        const min = Math.min(...values);
-                        const max = Math.max(...values);
-                        const numBins = 50;
-                        const binSize = (max - min) / numBins;
-                        
-                        const bins = Array(numBins).fill().map(() => []);
-                        for (let i = 0; i < values.length; i++) {
-                            const binIndex = Math.min(Math.floor((values[i] - min) / binSize), numBins - 1);
-                            bins[binIndex].push(i);
-                        }
-                        
-                        binCache[col] = {
-                            bins,
-                            min,
-                            max,
-                            binSize,
-                            numBins,
-                            maxCount: Math.max(...bins.map(bin => bin.length))
-                        };
-                    } else if (colType === 'time') {
-                        const min = Math.min(...values);
-                        const max = Math.max(...values);
-                        const numBins = 24; // 24 hour bins
-                        const binSize = (max - min) / numBins;
-                        
-                        const bins = Array(numBins).fill().map(() => []);
-                        for (let i = 0; i < values.length; i++) {
-                            const binIndex = Math.min(Math.floor((values[i] - min) / binSize), numBins - 1);
-                            bins[binIndex].push(i);
-                        }
-                        
-                        binCache[col] = {
-                            bins,
-                            min,
-                            max,
-                            binSize,
-                            numBins,
-                            maxCount: Math.max(...bins.map(bin => bin.length))
-                        };
-                    } else if (colType === 'string') {
-                        // For categorical data, count unique values
-                        const uniqueValues = [...new Set(values)];
-                        if (uniqueValues.length <= 20) {
-                            const counts = {};
-                            const filteredCounts = {};
-                            
-                            for (const val of uniqueValues) {
-                                counts[val] = values.filter(v => v === val).length;
-                                filteredCounts[val] = 0;
-                            }
-                            
-                            binCache[col] = {
-                                uniqueValues,
-                                counts,
-                                filteredCounts,
-                                maxCount: Math.max(...Object.values(counts))
-                            };
-                        }
-                    }
-                }
-            }
-            
-            static getFilteredData(column) {
-                if (!filteredIndices) return [];
-                return data[column].filter((_, i) => filteredIndices[i]);
-            }
-            
-            static updateFilteredIndices(newIndices) {
-                filteredIndices = newIndices;
-                DataExplorer.updateStats();
-                DataExplorer.updateRanges();
-                DataExplorer.updateAllCharts();
-            }
-        }
-        
-        // ============================================================================
-        // FILTER MANAGEMENT
-        // ============================================================================
-        
-        class FilterManager {
-            static applyFilters() {
-                if (!filteredIndices) return;
-                
-                const newIndices = new Uint8Array(currentRows);
-                newIndices.fill(1);
-                
-                // Apply each filter
-                for (const [column, filter] of Object.entries(filters)) {
-                    if (!filter) continue;
-                    
-                    if (Array.isArray(filter)) {
-                        // Range filter [min, max]
-                        const [min, max] = filter;
-                        for (let i = 0; i < currentRows; i++) {
-                            if (newIndices[i] && (data[column][i] < min || data[column][i] > max)) {
-                                newIndices[i] = 0;
-                            }
-                        }
-                    } else if (filter instanceof Set) {
-                        // Categorical filter
-                        for (let i = 0; i < currentRows; i++) {
-                            if (newIndices[i] && !filter.has(data[column][i])) {
-                                newIndices[i] = 0;
-                            }
-                        }
-                    }
-                }
-                
-                DataManager.updateFilteredIndices(newIndices);
-            }
-            
-            static setFilter(column, filterValue) {
-                filters[column] = filterValue;
-                this.applyFilters();
-            }
-            
-            static clearFilter(column) {
-                filters[column] = null;
-                this.applyFilters();
-            }
-            
-            static clearAllFilters() {
-                for (const col of Object.keys(filters)) {
-                    filters[col] = null;
-                }
-                filteredIndices.fill(1);
-                DataExplorer.updateStats();
-                DataExplorer.updateRanges();
-                DataExplorer.updateAllCharts();
-            }
-        }
-        
-        // ============================================================================
-        // CHART SYSTEM
-        // ============================================================================
-        
-        class Chart {
-            constructor(canvasId) {
-                this.canvas = document.getElementById(canvasId);
-                this.ctx = this.canvas.getContext('2d');
-                this.width = 0;
-                this.height = 0;
-                this.resize();
-                
-                // Bind events
-                this.canvas.addEventListener('mousedown', this.onMouseDown.bind(this));
-                this.canvas.addEventListener('mousemove', this.onMouseMove.bind(this));
-                this.canvas.addEventListener('mouseup', this.onMouseUp.bind(this));
-                this.canvas.addEventListener('click', this.onClick.bind(this));
-                window.addEventListener('resize', this.resize.bind(this));
-            }
-            
-            resize() {
-                const rect = this.canvas.parentElement.getBoundingClientRect();
-                const dpr = window.devicePixelRatio || 1;
-                this.canvas.width = (rect.width - 16) * dpr;
-                this.canvas.height = (rect.height - 36) * dpr;
-                this.canvas.style.width = (rect.width - 16) + 'px';
-                this.canvas.style.height = (rect.height - 36) + 'px';
-                this.ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
-                this.width = rect.width - 16;
-                this.height = rect.height - 36;
-                this.draw();
-            }
-            
-            clear() {
-                this.ctx.fillStyle = '#1a1a1a';
-                this.ctx.fillRect(0, 0, this.width, this.height);
-            }
-            
-            getMousePos(e) {
-                const r = this.canvas.getBoundingClientRect();
-                return {
-                    x: (e.clientX - r.left) * (this.width / r.width),
-                    y: (e.clientY - r.top) * (this.height / r.height)
-                };
-            }
-            
-            onMouseDown(e) {}
-            onMouseMove(e) {}
-            onMouseUp(e) {}
-            onClick(e) {}
-            draw() {}
-            
-            destroy() {
-                window.removeEventListener('resize', this.resize);
-                this.canvas.replaceWith(this.canvas.cloneNode(true));
-            }
-        }
+        rows = pd.DataFrame(self.config["data"], columns=self.config["columns"])
+        df = self._fold_long_tails(rows)
+        config = dict(self.config)
+        if has_grids:
+            # Heatmaps are usually added after loading, so their grids are binned here
+            config["summaries"] = {**self.config["summaries"], **self._generate_grid_summaries(df)}
+        if matrix:
+            config["correlation"] = self._compute_correlation(df, matrix["columns"])
+        if lines:
+            config["pyramids"] = {f"{chart['column']}|{chart['y']}": self._compute_pyramid(df, chart["column"], chart["y"])
+                                  for chart in lines}
+        if scatters:
+            config["rasters"] = {f"{chart['column']}|{chart['y']}": self._compute_rasters(df, chart["column"], chart["y"])
+                                 for chart in scatters}
+        if self.cube_mode:
+            cube = self._compute_cube(df)
+            if cube:
+                config["cube"] = cube
+        if self.bitmap_indexes:
+            config["bitmaps"] = self._encode_bitmaps(df)
+        if self.encode_columns:
+            del config["data"]
+            config["rowCount"] = len(df)
+            config["encodedColumns"] = self._encode_columns(df)
+            for col in self.config.get("foldedValues", {}):
+                # The table and exports show the values behind "Other"
+                config["encodedColumns"][col]["labels"] = self._encode_codes(rows[col])
+        return config
+    
+    def _encode_codes(self, series: pd.Series) -> Dict[str, Any]:
+        """Dictionary codes in order of first appearance, in the narrowest type, with their dictionary"""
+        codes, uniques = self._factorize(series)
+        if len(uniques) <= 0x100:
+            encoded = self._encode_array(codes.astype('<u1'), "u8")
+        elif len(uniques) <= 0x10000:
+            encoded = self._encode_array(codes.astype('<u2'), "u16")
+        else:
+            encoded = self._encode_array(codes.astype('<i4'), "i32")
+        encoded["dictionary"] = pd.Index(uniques).tolist()
+        return encoded
+    
+    def _encode_columns(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Encode each column as the little-endian TypedArray the page holds it in"""
+        encoded = {}
         
-        class HistogramChart extends Chart {
-            constructor(canvasId, column) {
-                super(canvasId);
-                this.column = column;
-                this.margin = { top: 10, right: 10, bottom: 40, left: 50 };
-                this.isInteracting = false;
-                this.isDragging = false;
-                this.dragStart = 0;
-                this.selection = null;
-            }
-            
-            draw() {
-                this.clear();
-                if (!binCache[this.column]) return;
-                
-                const binData = binCache[this.column];
-                const width = this.width - this.margin.left - this.margin.right;
-                const height = this.height - this.margin.top - this.margin.bottom;
-                const barWidth = width / binData.bins.length;
-                
-                // Calculate counts
-                const counts = new Float32Array(binData.bins.length);
-                const filteredCounts = new Float32Array(binData.bins.length);
-                
-                for (let i = 0; i < binData.bins.length; i++) {
-                    const bin = binData.bins[i];
-                    counts[i] = bin.length;
-                    
-                    if (bin.length > 1000) {
-                        // Sample for performance
-                        let sampled = 0;
-                        const step = Math.max(1, Math.floor(bin.length / 1000));
-                        for (let j = 0; j < bin.length && sampled < 1000; j += step) {
-                            if (filteredIndices[bin[j]]) sampled++;
-                        }
-                        filteredCounts[i] = (sampled / Math.min(1000, bin.length)) * bin.length;
-                    } else {
-                        filteredCounts[i] = bin.filter(idx => filteredIndices[idx]).length;
-                    }
-                }
-                
-                const maxCount = binData.maxCount || Math.max(...counts);
-                
-                this.ctx.save();
-                this.ctx.translate(this.margin.left, this.margin.top);
-                
-                // Draw bars
-                for (let i = 0; i < binData.bins.length; i++) {
-                    const x = i * barWidth;
-                    const h = (counts[i] / maxCount) * height;
-                    const fh = (filteredCounts[i] / maxCount) * height;
-                    
-                    // Background bar
-                    this.ctx.fillStyle = '#2a2a2a';
-                    this.ctx.fillRect(x, height - h, barWidth - 1, h);
-                    
-                    // Filtered bar
-                    this.ctx.fillStyle = '#4a9eff';
-                    this.ctx.fillRect(x, height - fh, barWidth - 1, fh);
-                }
-                
-                // Selection overlay
-                if (this.selection) {
-                    this.ctx.fillStyle = 'rgba(255,255,255,0.1)';
-                    this.ctx.strokeStyle = '#feca57';
-                    this.ctx.lineWidth = 2;
-                    const x1 = this.selection[0] * barWidth;
-                    const x2 = (this.selection[1] + 1) * barWidth;
-                    this.ctx.fillRect(x1, 0, x2 - x1, height);
-                    this.ctx.strokeRect(x1, 0, x2 - x1, height);
-                }
-                
-                // Axes
-                this.ctx.strokeStyle = '#444';
-                this.ctx.beginPath();
-                this.ctx.moveTo(0, height);
-                this.ctx.lineTo(width, height);
-                this.ctx.moveTo(0, 0);
-                this.ctx.lineTo(0, height);
-                this.ctx.stroke();
-                
-                // Labels
-                this.ctx.fillStyle = '#888';
-                this.ctx.font = '10px -apple-system, sans-serif';
-                this.ctx.textAlign = 'center';
-                
-                const stepL = Math.max(1, Math.floor(binData.bins.length / 10));
-                for (let i = 0; i < binData.bins.length; i += stepL) {
-                    const x = i * barWidth;
-                    const val = binData.min + i * binData.binSize;
-                    this.ctx.fillText(formatValue(val, DataExplorerConfig.columnTypes[this.column]), x, height + 15);
-                }
-                this.ctx.fillText(formatValue(binData.max, DataExplorerConfig.columnTypes[this.column]), binData.bins.length * barWidth, height + 15);
-                
-                this.ctx.restore();
-            }
-            
-            onMouseDown(e) {
-                const p = this.getMousePos(e);
-                if (!this.isInChartArea(p)) return;
-                
-                const x = p.x - this.margin.left;
-                const width = this.width - this.margin.left - this.margin.right;
-                const bin = Math.floor(x / (width / binCache[this.column].bins.length));
-                
-                if (bin >= 0 && bin < binCache[this.column].bins.length) {
-                    this.isDragging = true;
-                    this.isInteracting = true;
-                    this.dragStart = bin;
-                }
-            }
-            
-            onMouseMove(e) {
-                if (!this.isDragging) return;
-                
-                const p = this.getMousePos(e);
-                const x = p.x - this.margin.left;
-                const width = this.width - this.margin.left - this.margin.right;
-                
-                if (x >= 0 && x <= width) {
-                    const bin = Math.floor(x / (width / binCache[this.column].bins.length));
-                    if (bin >= 0 && bin < binCache[this.column].bins.length) {
-                        this.selection = [Math.min(this.dragStart, bin), Math.max(this.dragStart, bin)];
-                        this.draw();
-                    }
-                }
-            }
-            
-            onMouseUp() {
-                if (this.isDragging && this.selection) {
-                    const binData = binCache[this.column];
-                    const min = binData.min + this.selection[0] * binData.binSize;
-                    const max = binData.min + (this.selection[1] + 1) * binData.binSize;
-                    
-                    FilterManager.setFilter(this.column, [min, max]);
-                }
-                
-                this.isDragging = false;
-                setTimeout(() => { this.isInteracting = false; }, 100);
-            }
-            
-            onClick(e) {
-                if (!this.isInteracting) {
-                    const p = this.getMousePos(e);
-                    if (this.isInChartArea(p)) {
-                        this.selection = null;
-                        FilterManager.clearFilter(this.column);
-                        this.draw();
-                    }
-                }
-            }
+        for col in df.columns:
+            col_type = self.config["columnTypes"].get(col, "string")
             
-            isInChartArea(p) {
-                return p.x >= this.margin.left && p.x <= this.width - this.margin.right &&
-                       p.y >= this.margin.top && p.y <= this.height - this.margin.bottom;
-            }
-        }
+            if col_type == "integer":
+                encoded[col] = self._encode_array(df[col].to_numpy().astype('<i4'), "i32")
+            elif col_type in ("number", "angle"):
+                encoded[col] = self._encode_array(df[col].to_numpy(dtype=np.float64).astype('<f4'), "f32")
+            elif col_type == "time":
+                seconds = self._time_to_seconds(df[col]).to_numpy(dtype=np.float64)
+                encoded[col] = self._encode_array(seconds.astype('<f4'), "f32")
+            else:
+                encoded[col] = self._encode_codes(df[col])
         
-        class CategoricalChart extends Chart {
-            constructor(canvasId, column) {
-                super(canvasId);
-                this.column = column;
-                this.margin = { top: 20, right: 10, bottom: 40, left: 60 };
-                this.selected = new Set();
-            }
-            
-            draw() {
-                this.clear();
-                if (!binCache[this.column]) return;
-                
-                const binData = binCache[this.column];
-                const width = this.width - this.margin.left - this.margin.right;
-                const height = this.height - this.margin.top - this.margin.bottom;
-                
-                const uniqueValues = binData.uniqueValues;
-                const barWidth = width / uniqueValues.length;
-                const colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57', '#ff9ff3'];
-                
-                this.ctx.save();
-                this.ctx.translate(this.margin.left, this.margin.top);
-                
-                // Draw bars
-                for (let i = 0; i < uniqueValues.length; i++) {
-                    const x = i * barWidth;
-                    const value = uniqueValues[i];
-                    const count = binData.counts[value];
-                    const filteredCount = binData.filteredCounts[value] || 0;
-                    
-                    const h = (count / binData.maxCount) * height;
-                    const fh = (filteredCount / binData.maxCount) * height;
-                    
-                    // Background bar
-                    this.ctx.fillStyle = '#2a2a2a';
-                    this.ctx.fillRect(x, height - h, barWidth - 1, h);
-                    
-                    // Filtered bar
-                    const isSelected = this.selected.size === 0 || this.selected.has(value);
-                    this.ctx.fillStyle = isSelected ? colors[i % colors.length] : '#444';
-                    this.ctx.fillRect(x, height - fh, barWidth - 1, fh);
-                    
-                    // Selection border
-                    if (this.selected.has(value)) {
-                        this.ctx.strokeStyle = '#feca57';
-                        this.ctx.lineWidth = 2;
-                        this.ctx.strokeRect(x - 1, height - h - 1, barWidth + 2, h + 2);
-                    }
-                    
-                    // Label
-                    this.ctx.fillStyle = '#888';
-                    this.ctx.font = '10px -apple-system, sans-serif';
-                    this.ctx.textAlign = 'center';
-                    this.ctx.fillText(value.toString(), x + barWidth / 2, height + 20);
-                }
-                
-                this.ctx.restore();
-            }
-            
-            onMouseDown(e) {
-                const p = this.getMousePos(e);
-                const width = this.width - this.margin.left - this.margin.right;
-                const height = this.height - this.margin.top - this.margin.bottom;
-                
-                const x = p.x - this.margin.left;
-                const y = p.y - this.margin.top;
-                
-                if (x >= 0 && x <= width && y >= 0 && y <= height) {
-                    const barWidth = width / binCache[this.column].uniqueValues.length;
-                    const barIndex = Math.floor(x / barWidth);
-                    
-                    if (barIndex >= 0 && barIndex < binCache[this.column].uniqueValues.length) {
-                        const value = binCache[this.column].uniqueValues[barIndex];
-                        
-                        if (this.selected.has(value)) {
-                            this.selected.delete(value);
-                        } else {
-                            this.selected.add(value);
-                        }
-                        
-                        // Update filter
-                        if (this.selected.size > 0 && this.selected.size < binCache[this.column].uniqueValues.length) {
-                            FilterManager.setFilter(this.column, this.selected);
-                        } else {
-                            FilterManager.clearFilter(this.column);
-                        }
-                        
-                        this.draw();
-                    }
-                }
-            }
-        }
+        return encoded
+    
+    def _encode_bitmaps(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Roaring-style row bitmaps for each value of each low-cardinality string column"""
+        bitmaps = {}
         
-        class TimeChart extends HistogramChart {
-            constructor(canvasId, column) {
-                super(canvasId, column);
+        for col in df.columns:
+            if self.config["columnTypes"].get(col, "string") != "string":
+                continue
+            codes, uniques = self._factorize(df[col])
+            if len(uniques) > self.bitmap_max_values:
+                continue
+            bitmaps[col] = {
+                "values": pd.Index(uniques).tolist(),
+                "bitmaps": [self._roaring_containers(np.flatnonzero(codes == code)) for code in range(len(uniques))]
             }
-            
-            // Inherits all functionality from HistogramChart
-        }
         
-        // ============================================================================
-        // MAIN DATA EXPLORER CLASS
-        // ============================================================================
-        
-        class DataExplorer {
-            static init() {
-                if (window.DataExplorerConfig) {
-                    DataManager.init(window.DataExplorerConfig);
-                } else {
-                    // Default configuration for testing
-                    this.createDefaultConfig();
-                }
-            }
-            
-            static createDefaultConfig() {
-                // Create sample data for testing
-                const sampleData = [];
-                for (let i = 0; i < 1000; i++) {
-                    sampleData.push({
-                        id: i,
-                        age: Math.floor(Math.random() * 50) + 20,
-                        salary: Math.floor(Math.random() * 80000) + 30000,
-                        department: ['Engineering', 'Sales', 'Marketing', 'HR'][Math.floor(Math.random() * 4)],
-                        experience: Math.floor(Math.random() * 20) + 1
-                    });
-                }
-                
-                const config = {
-                    title: "Sample Data Explorer",
-                    columns: ["id", "age", "salary", "department", "experience"],
-                    data: sampleData,
-                    columnTypes: {
-                        "id": "integer",
-                        "age": "integer",
-                        "salary": "integer",
-                        "department": "string",
-                        "experience": "integer"
-                    },
-                    chartTypes: [
-                        { type: "histogram", column: "age", title: "Age Distribution" },
-                        { type: "histogram", column: "salary", title: "Salary Distribution" },
-                        { type: "categorical", column: "department", title: "Department Breakdown" },
-                        { type: "histogram", column: "experience", title: "Experience Distribution" }
-                    ],
-                    miniMetrics: [
-                        { id: "filtered", label: "Filtered Rows" },
-                        { id: "percent", label: "of Total" },
-                        { id: "avg_age", label: "Avg Age" },
-                        { id: "avg_salary", label: "Avg Salary" }
-                    ]
-                };
-                
-                DataManager.init(config);
-            }
-            
-            static createChartGrid() {
-                const grid = document.getElementById('chartGrid');
-                grid.innerHTML = '';
-                
-                for (const chartConfig of DataExplorerConfig.chartTypes) {
-                    const panel = document.createElement('div');
-                    panel.className = 'panel';
-                    
-                    const title = document.createElement('div');
-                    title.className = 'panel-title';
-                    title.textContent = chartConfig.title;
-                    panel.appendChild(title);
-                    
-                    const canvas = document.createElement('canvas');
-                    canvas.id = `canvas_${chartConfig.column}`;
-                    panel.appendChild(canvas);
-                    
-                    grid.appendChild(panel);
-                    
-                    // Create chart instance
-                    let chart;
-                    if (chartConfig.type === 'histogram') {
-                        chart = new HistogramChart(`canvas_${chartConfig.column}`, chartConfig.column);
-                    } else if (chartConfig.type === 'categorical') {
-                        chart = new CategoricalChart(`canvas_${chartConfig.column}`, chartConfig.column);
-                    } else if (chartConfig.type === 'time') {
-                        chart = new TimeChart(`canvas_${chartConfig.column}`, chartConfig.column);
-                    }
-                    
-                    if (chart) {
-                        charts[chartConfig.column] = chart;
-                    }
-                }
-            }
-            
-            static createMiniGrid() {
-                const miniGrid = document.getElementById('miniGrid');
-                miniGrid.innerHTML = '';
-                
-                for (const metric of DataExplorerConfig.miniMetrics) {
-                    const panel = document.createElement('div');
-                    panel.className = 'mini-panel';
-                    
-                    const value = document.createElement('div');
-                    value.className = 'mini-value';
-                    value.id = `mini_${metric.id}`;
-                    value.textContent = '0';
-                    panel.appendChild(value);
-                    
-                    const label = document.createElement('div');
-                    label.className = 'mini-label';
-                    label.textContent = metric.label;
-                    panel.appendChild(label);
-                    
-                    miniGrid.appendChild(panel);
-                }
-            }
-            
-            static updateStats() {
-                if (!filteredIndices) return;
-                
-                const totalCount = currentRows;
-                const filteredCount = filteredIndices.reduce((sum, val) => sum + val, 0);
-                const percent = totalCount > 0 ? ((filteredCount / totalCount) * 100).toFixed(1) : 0;
-                
-                document.getElementById('totalCount').textContent = formatCount(totalCount);
-                document.getElementById('filteredCount').textContent = formatCount(filteredCount);
-                document.getElementById('percentFiltered').textContent = percent + '%';
-                
-                // Update mini metrics
-                this.updateMiniMetrics();
-            }
-            
-            static updateMiniMetrics() {
-                if (!filteredIndices) return;
-                
-                const filteredCount = filteredIndices.reduce((sum, val) => sum + val, 0);
-                const totalCount = currentRows;
-                
-                // Update filtered count
-                const filteredElement = document.getElementById('mini_filtered');
-                if (filteredElement) {
-                    filteredElement.textContent = formatCount(filteredCount);
-                }
-                
-                // Update percentage
-                const percentElement = document.getElementById('mini_percent');
-                if (percentElement) {
-                    const percent = totalCount > 0 ? ((filteredCount / totalCount) * 100).toFixed(1) : 0;
-                    percentElement.textContent = percent + '%';
-                }
-                
-                // Update averages
-                for (const metric of DataExplorerConfig.miniMetrics) {
-                    if (metric.id.startsWith('avg_')) {
-                        const column = metric.id.substring(4);
-                        if (data[column] && DataExplorerConfig.columnTypes[column] === 'number' || DataExplorerConfig.columnTypes[column] === 'integer') {
-                            const filteredData = data[column].filter((_, i) => filteredIndices[i]);
-                            if (filteredData.length > 0) {
-                                const avg = filteredData.reduce((sum, val) => sum + val, 0) / filteredData.length;
-                                const element = document.getElementById(`mini_${metric.id}`);
-                                if (element) {
-                                    element.textContent = formatValue(avg, DataExplorerConfig.columnTypes[column]);
-                                }
-                            }
-                        }
-                    }
-                }
-            }
-            
-            static updateRanges() {
-                if (!filteredIndices) return;
-                
-                const rangeDisplay = document.getElementById('rangeDisplay');
-                rangeDisplay.innerHTML = '';
-                
-                for (const col of DataExplorerConfig.columns) {
-                    const colType = DataExplorerConfig.columnTypes[col];
-                    if (colType === 'number' || colType === 'integer') {
-                        const filteredData = data[col].filter((_, i) => filteredIndices[i]);
-                        if (filteredData.length > 0) {
-                            const min = Math.min(...filteredData);
-                            const max = Math.max(...filteredData);
-                            const avg = filteredData.reduce((sum, val) => sum + val, 0) / filteredData.length;
-                            
-                            const rangeItem = document.createElement('div');
-                            rangeItem.className = 'range-item';
-                            
-                            const label = document.createElement('div');
-                            label.className = 'range-label';
-                            label.textContent = col;
-                            rangeItem.appendChild(label);
-                            
-                            const value = document.createElement('div');
-                            value.className = 'range-value';
-                            value.textContent = `${formatValue(min, colType)} - ${formatValue(max, colType)} (avg: ${formatValue(avg, colType)})`;
-                            rangeItem.appendChild(value);
-                            
-                            rangeDisplay.appendChild(rangeItem);
-                        }
-                    }
-                }
-            }
-            
-            static updateAllCharts() {
-                for (const chart of Object.values(charts)) {
-                    chart.draw();
-                }
-            }
-            
-            static toggleStats() {
-                const panel = document.getElementById('statsPanel');
-                panel.style.display = panel.style.display === 'none' ? 'block' : 'none';
-                
-                if (panel.style.display === 'block') {
-                    this.updateStatsPanel();
-                }
-            }
-            
-            static updateStatsPanel() {
-                const panel = document.getElementById('statsPanel');
-                panel.innerHTML = '';
-                
-                if (!filteredIndices) return;
-                
-                const totalCount = currentRows;
-                const filteredCount = filteredIndices.reduce((sum, val) => sum + val, 0);
-                
-                const stats = [
-                    { label: 'Total Rows', value: formatCount(totalCount) },
-                    { label: 'Filtered Rows', value: formatCount(filteredCount) },
-                    { label: 'Filtered Percentage', value: ((filteredCount / totalCount) * 100).toFixed(1) + '%' }
-                ];
-                
-                for (const stat of stats) {
-                    const div = document.createElement('div');
-                    div.innerHTML = `${stat.label}: <strong>${stat.value}</strong>`;
-                    div.style.marginBottom = '4px';
-                    panel.appendChild(div);
-                }
-            }
-            
-            static toggleMiniMode() {
-                isMiniMode = !isMiniMode;
-                const mainGrid = document.getElementById('chartGrid');
-                const miniMode = document.getElementById('miniMode');
-                const rangeDisplay = document.getElementById('rangeDisplay');
-                
-                if (isMiniMode) {
-                    mainGrid.style.display = 'none';
-                    miniMode.style.display = 'block';
-                    rangeDisplay.style.display = 'none';
-                } else {
-                    mainGrid.style.display = 'grid';
-                    miniMode.style.display = 'none';
-                    rangeDisplay.style.display = 'flex';
-                }
-            }
-            
-            static resetAll() {
-                FilterManager.clearAllFilters();
-            }
-            
-            static exportCSV() {
-                if (!filteredIndices) return;
-                
-                const filteredData = [];
-                for (let i = 0; i < currentRows; i++) {
-                    if (filteredIndices[i]) {
-                        const row = {};
-                        for (const col of DataExplorerConfig.columns) {
-                            row[col] = data[col][i];
-                        }
-                        filteredData.push(row);
-                    }
-                }
-                
-                const csv = this.arrayToCSV(filteredData, DataExplorerConfig.columns);
-                this.downloadCSV(csv, 'filtered_data.csv');
-            }
-            
-            static arrayToCSV(data, columns) {
-                const header = columns.join(',');
-                const rows = data.map(row => columns.map(col => row[col]).join(','));
-                return [header, ...rows].join('\n');
-            }
-            
-            static downloadCSV(csv, filename) {
-                const blob = new Blob([csv], { type: 'text/csv' });
-                const url = window.URL.createObjectURL(blob);
-                const a = document.createElement('a');
-                a.href = url;
-                a.download = filename;
-                a.click();
-                window.URL.revokeObjectURL(url);
-            }
-            
-            static saveSnapshot() {
-                const snapshot = {
-                    timestamp: new Date().toISOString(),
-                    filters: filters,
-                    filteredCount: filteredIndices ? filteredIndices.reduce((sum, val) => sum + val, 0) : 0,
-                    totalCount: currentRows
-                };
-                
-                const dataStr = JSON.stringify(snapshot, null, 2);
-                const dataBlob = new Blob([dataStr], { type: 'application/json' });
-                const url = window.URL.createObjectURL(dataBlob);
-                const a = document.createElement('a');
-                a.href = url;
-                a.download = 'explorer_snapshot.json';
-                a.click();
-                window.URL.revokeObjectURL(url);
-            }
+        return bitmaps
+    
+    def _roaring_containers(self, rows: np.ndarray) -> Dict[str, Any]:
+        """Split sorted row numbers into 65536-row chunks, each a sorted list of
+        16-bit offsets or, past 4096 rows, a 2048-word bitmap"""
+        keys, starts = np.unique(rows >> 16, return_index=True)
+        containers = []
+        for chunk in np.split(rows, starts[1:]):
+            offsets = (chunk & 0xFFFF).astype('<u2')
+            if len(offsets) <= 4096:
+                containers.append(self._encode_array(offsets, "u16"))
+            else:
+                bits = np.zeros(0x10000, dtype=bool)
+                bits[offsets] = True
+                words = np.packbits(bits, bitorder='little').view('<u4')
+                containers.append(self._encode_array(words, "u32"))
+        return {"keys": keys.tolist(), "containers": containers}
+    
+    def _encode_array(self, values: np.ndarray, array_type: str) -> Dict[str, Any]:
+        """Base64 of an array's bytes, tagged with the TypedArray to view them as"""
+        return {
+            "type": array_type,
+            "data": base64.b64encode(values.tobytes()).decode('ascii')
         }
-        
-        // ============================================================================
-        // INITIALIZATION
-        // ============================================================================
-        
-        // Initialize when DOM is ready
-        document.addEventListener('DOMContentLoaded', () => {
-            DataExplorer.init();
-        });
-    </script>
-</body>
-</html>"""
+    
+    def _get_default_template(self) -> str:
+        """Get default HTML template"""
+        template_path = Path(__file__).with_name('data_explorer.html')
+        with open(template_path, 'r', encoding='utf-8') as f:
+            return f.read()
 
 def main():
     """Main function for command line usage"""
@@ -10,6 +10,14 @@ import time
 from pathlib import Path
 from data_loader import DataExplorerConfig
 
+def decode_array(encoded):
+    """NumPy view of an array embedded by DataExplorerConfig._encode_array"""
+    import base64
+    import numpy as np
+    
+    dtypes = {"u8": '<u1', "u16": '<u2', "u32": '<u4', "i32": '<i4', "f32": '<f4'}
+    return np.frombuffer(base64.b64decode(encoded["data"]), dtype=dtypes[encoded["type"]])
+
 def test_numerical_data():
     """Test numerical data configuration"""
     print("Testing numerical data configuration...")
@@ -158,6 +166,392 @@ def test_performance():
     
     return results
 
+def test_summaries():
+    """Test first-paint summaries"""
+    print("Testing first-paint summaries...")
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_numerical.csv")
+    summaries = config.config["summaries"]
+    
+    # Every chart can be painted before the rows are decoded
+    for chart in config.config["chartTypes"]:
+        assert chart["column"] in summaries
+    
+    # Histograms cover every row and use the page's bin counts
+    age = summaries["age"]
+    assert len(age["counts"]) == 50
+    assert sum(age["counts"]) == 50000
+    assert age["stats"]["count"] == 50000
+    ages = [row["age"] for row in config.config["data"]]
+    assert age["min"] == min(ages) and age["max"] == max(ages)
+    
+    # Categorical counts follow the order of first appearance
+    department = summaries["department"]
+    first_values = list(dict.fromkeys(row["department"] for row in config.config["data"]))
+    assert department["values"] == first_values
+    assert sum(department["counts"]) == 50000
+    
+    print("✓ First-paint summaries verified")
+    return config
+
+def test_column_encoding():
+    """Test lazily decoded column encoding"""
+    print("Testing column encoding...")
+    
+    import numpy as np
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_numerical.csv")
+    page_config = config._page_config()
+    
+    # Columns replace the row records in the page
+    assert "data" not in page_config
+    assert page_config["rowCount"] == 50000
+    encoded = page_config["encodedColumns"]
+    assert set(encoded) == set(config.config["columns"])
+    
+    # Numeric columns decode to the values the page would hold
+    ages = decode_array(encoded["age"])
+    assert encoded["age"]["type"] == "i32"
+    assert ages.tolist() == [row["age"] for row in config.config["data"]]
+    
+    heights = decode_array(encoded["height"])
+    assert encoded["height"]["type"] == "f32"
+    assert np.allclose(heights, [row["height"] for row in config.config["data"]], rtol=1e-6)
+    
+    # String columns become dictionary codes
+    department = encoded["department"]
+    codes = decode_array(department)
+    assert department["type"] == "u8"
+    assert [department["dictionary"][c] for c in codes[:100]] == [row["department"] for row in config.config["data"][:100]]
+
+    # Missing strings get their own code where they first appear
+    import pandas as pd
+    missing = DataExplorerConfig()
+    missing.load_dataframe(pd.DataFrame({"team": ["b", "a", None, "b", "c", None]}))
+    team = missing._page_config()["encodedColumns"]["team"]
+    assert decode_array(team).tolist() == [0, 1, 2, 0, 3, 2]
+    assert team["dictionary"][:2] + team["dictionary"][3:] == ["b", "a", "c"]
+
+    # Row records can still be embedded
+    config.set_column_encoding(False)
+    assert "data" in config._page_config()
+    
+    print("✓ Column encoding verified")
+    return config
+
+def test_heatmap_grids():
+    """Test precomputed heatmap density grids"""
+    print("Testing heatmap grids...")
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_numerical.csv")
+    config.add_heatmap("age", "height")
+    assert config.config["chartTypes"][-1]["y"] == "height"
+    
+    # The grid is embedded with the page and keyed by the column pair
+    summaries = config._page_config()["summaries"]
+    grid = summaries["age|height"]["counts"]
+    assert len(grid) == 50 * 50
+    assert sum(grid) == 50000
+    
+    # Summing out either axis gives back that column's histogram
+    for x in range(50):
+        assert sum(grid[x * 50:(x + 1) * 50]) == summaries["age"]["counts"][x]
+    for y in range(50):
+        assert sum(grid[y::50]) == summaries["height"]["counts"][y]
+    
+    print("✓ Heatmap grids verified")
+    return config
+
+def test_category_cube():
+    """Test category x numeric count cubes"""
+    print("Testing category cubes...")
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_numerical.csv")
+    config.add_small_multiples("salary", "department")
+    summaries = config._page_config()["summaries"]
+    departments = summaries["department"]
+    cube = summaries["department|salary"]["counts"]
+    assert len(cube) == len(departments["values"]) * 50
+    
+    # Each category's row is its histogram; the rows add up to the column's
+    for code, count in enumerate(departments["counts"]):
+        assert sum(cube[code * 50:(code + 1) * 50]) == count
+    for b in range(50):
+        assert sum(cube[b::50]) == summaries["salary"]["counts"][b]
+    
+    # No cube is embedded for a category column too wide for the page to chart
+    config.max_chart_categories = len(departments["values"]) - 1
+    assert "department|salary" not in config._page_config()["summaries"]
+    
+    print("✓ Category cubes verified")
+    return config
+
+def test_cube_mode():
+    """Test the embedded aggregate cube"""
+    print("Testing aggregate cube...")
+    
+    import numpy as np
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_numerical.csv")
+    config.set_cube_mode()
+    
+    # Six continuous dimensions have nearly a cell per row, so no cube is embedded
+    assert "cube" not in config._page_config()
+    
+    config.set_chart_types([
+        {"type": "histogram", "column": "age"},
+        {"type": "categorical", "column": "department"}
+    ])
+    cube = config._page_config()["cube"]
+    assert cube["dimensions"] == ["age", "department"]
+    
+    ages = decode_array(cube["cells"][0])
+    counts = decode_array(cube["counts"])
+    assert counts.sum() == 50000
+    
+    # Summing the cells of each bin gives back the column's histogram
+    histogram = np.bincount(ages, weights=counts, minlength=cube["bins"][0] + 1)
+    assert histogram[:cube["bins"][0]].tolist() == config.config["summaries"]["age"]["counts"]
+    
+    # The size guard leaves the cube out
+    config.set_cube_mode(max_cells=10)
+    assert "cube" not in config._page_config()
+    
+    print("✓ Aggregate cube verified")
+    return config
+
+def test_bitmap_indexes():
+    """Test per-value bitmap indexes of string columns"""
+    print("Testing bitmap indexes...")
+    
+    import numpy as np
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_categorical.csv")
+    index = config._page_config()["bitmaps"]["education"]
+    values = config.config["data"]
+    
+    # Every row is in exactly the bitmap of its value
+    for code, bitmap in enumerate(index["bitmaps"]):
+        rows = []
+        for key, container in zip(bitmap["keys"], bitmap["containers"]):
+            data = decode_array(container)
+            if container["type"] == "u32":
+                offsets = np.flatnonzero(np.unpackbits(data.view(np.uint8), bitorder='little'))
+            else:
+                offsets = data
+            rows.extend((key << 16) + offsets)
+        expected = [i for i, row in enumerate(values) if row["education"] == index["values"][code]]
+        assert rows == expected
+    
+    config.set_bitmap_indexes(False)
+    assert "bitmaps" not in config._page_config()
+    
+    print("✓ Bitmap indexes verified")
+    return config
+
+def test_line_pyramid():
+    """Test the downsampled time-series pyramid"""
+    print("Testing line chart pyramid...")
+    
+    import numpy as np
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_time.csv")
+    config.add_line_chart("time", "wait_time")
+    pyramid = config._page_config()["pyramids"]["time|wait_time"]
+    assert [level["buckets"] for level in pyramid["levels"]] == [256, 1024, 4096, 16384, 65536]
+    
+    wait_time = config.config["summaries"]["wait_time"]
+    for level in pyramid["levels"]:
+        counts = decode_array(level["count"])
+        assert counts.sum() == 30000
+        
+        # Every level's envelope spans the whole column
+        assert np.nanmin(decode_array(level["min"])) == wait_time["min"]
+        assert np.nanmax(decode_array(level["max"])) == wait_time["max"]
+        assert np.isnan(decode_array(level["mean"])[counts == 0]).all()
+    
+    print("✓ Line chart pyramid verified")
+    return config
+
+def test_scatter_rasters():
+    """Test the embedded scatter density rasters"""
+    print("Testing scatter rasters...")
+    
+    import numpy as np
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_numerical.csv")
+    config.add_scatter("height", "weight")
+    rasters = config._page_config()["rasters"]["height|weight"]
+    
+    # 512 x 512 would be more than 4 cells per point for 50,000 points
+    assert [level["size"] for level in rasters["levels"]] == [256]
+    config.raster_cells_per_point = 8
+    assert [level["size"] for level in config._page_config()["rasters"]["height|weight"]["levels"]] == [256, 512]
+    assert rasters["x"] == [config.config["summaries"]["height"]["min"], config.config["summaries"]["height"]["max"]]
+    
+    for level in rasters["levels"]:
+        size = level["size"]
+        counts = decode_array(level["counts"]).reshape(size, size)
+        assert counts.sum() == 50000
+        
+        # Summing the rows of cells gives the x marginal at that resolution
+        heights = np.array([row["height"] for row in config.config["data"]], dtype=np.float32).astype(np.float64)
+        lo, hi = rasters["x"]
+        ids = np.minimum(np.floor((heights - lo) * (size / (hi - lo))), size - 1).astype(int)
+        assert counts.sum(axis=0).tolist() == np.bincount(ids, minlength=size).tolist()
+    
+    print("✓ Scatter rasters verified")
+    return config
+
+def test_angle_columns():
+    """Test angle detection and polar bins"""
+    print("Testing angle columns...")
+    
+    import numpy as np
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_angle.csv")
+    types = config.config["columnTypes"]
+    assert types["angle_degrees"] == "angle"
+    assert types["wind_direction"] == "angle"  # "134°" strings
+    assert types["angle_radians"] == "number"
+    assert types["humidity"] == "number"
+    assert any(chart["type"] == "angle" for chart in config.config["chartTypes"])
+    
+    # A 0-360 range alone is not enough: scores stay numbers until charted as angles
+    import pandas as pd
+    scores = DataExplorerConfig()
+    scores.load_dataframe(pd.DataFrame({"score": np.arange(1000) % 351}))
+    assert scores.config["columnTypes"]["score"] == "integer"
+    scores.add_angle_chart("score")
+    assert scores.config["columnTypes"]["score"] == "angle"
+    assert len(scores.config["summaries"]["score"]["counts"]) == 36
+    
+    # 36 sectors of 10 degrees over the fixed circle
+    sectors = config.config["summaries"]["angle_degrees"]
+    angles = np.array([row["angle_degrees"] for row in config.config["data"]], dtype=np.float32)
+    assert (sectors["min"], sectors["max"]) == (0.0, 360.0)
+    assert sectors["counts"] == np.bincount((angles // 10).astype(int) % 36, minlength=36).tolist()
+    
+    # Polar bins: each sector's magnitude rings add up to the sector
+    config.add_angle_chart("angle_degrees", "wind_speed")
+    polar = config._page_config()["summaries"]["angle_degrees|wind_speed"]["counts"]
+    assert len(polar) == 36 * 50
+    for sector, count in enumerate(sectors["counts"]):
+        assert sum(polar[sector * 50:(sector + 1) * 50]) == count
+    
+    print("✓ Angle columns verified")
+    return config
+
+def test_heavy_hitters():
+    """Test top-K folding of high-cardinality string columns"""
+    print("Testing heavy hitters...")
+    
+    import numpy as np
+    import pandas as pd
+    
+    # Zipf-like hosts: a few heavy hitters over a long tail
+    rng = np.random.default_rng(7)
+    hosts = [f"host{h}" for h in np.minimum(rng.zipf(1.5, 5000), 500)]
+    df = pd.DataFrame({"host": hosts, "id": [f"row{i}" for i in range(5000)], "value": rng.normal(size=5000)})
+    config = DataExplorerConfig()
+    config.load_dataframe(df)
+    
+    # The heaviest values are kept exactly and the rest are counted as "Other"
+    top = pd.Series(hosts).value_counts()
+    assert config.config["otherValues"]["host"] == "Other"
+    summary = config.config["summaries"]["host"]
+    counts = dict(zip(summary["values"], summary["counts"]))
+    assert len(counts) == config.top_k_values + 1
+    assert all(counts[host] == count for host, count in top.iloc[:config.top_k_values].items())
+    assert counts["Other"] == top.iloc[config.top_k_values:].sum()
+    assert any(chart["type"] == "categorical" and chart["column"] == "host" for chart in config.config["chartTypes"])
+    
+    # Near-uniform columns are folded too, but not charted as mostly "Other"
+    assert config.config["otherValues"].get("id") == "Other"
+    assert not any(chart["column"] == "id" for chart in config.config["chartTypes"])
+    
+    # One heavy URL among 7,000 rare ones still gets a 21-value chart
+    urls = DataExplorerConfig()
+    urls.load_dataframe(pd.DataFrame({"url": ["/home"] * 3000 + [f"/item/{i}" for i in range(7000)]}))
+    assert len(urls.config["summaries"]["url"]["values"]) == urls.top_k_values + 1
+    assert [chart["column"] for chart in urls.config["chartTypes"]] == ["url"]
+    
+    # The page gets the reduced dictionary and a bitmap for "Other"
+    page = config._page_config()
+    assert sorted(page["encodedColumns"]["host"]["dictionary"]) == sorted(counts)
+    assert "Other" in page["bitmaps"]["host"]["values"]
+
+    # Folding only affects charts and filters: the rows keep their own values
+    assert [row["host"] for row in config.config["data"]] == hosts
+    labels = page["encodedColumns"]["host"]["labels"]
+    assert [labels["dictionary"][code] for code in decode_array(labels)] == hosts
+    ids = page["encodedColumns"]["id"]["labels"]
+    assert [ids["dictionary"][code] for code in decode_array(ids)[:3]] == ["row0", "row1", "row2"]
+
+    print("✓ Heavy hitters verified")
+    return config
+
+def test_quantile_sketches():
+    """Test per-bin quantile sketches"""
+    print("Testing quantile sketches...")
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_numerical.csv")
+    salary = config.config["summaries"]["salary"]
+    points = config.quantile_points + 1
+    assert len(salary["quantiles"]) == len(salary["counts"]) * points
+    
+    # Each bin's sketch runs from its smallest to its largest value
+    sketches = [salary["quantiles"][b * points:(b + 1) * points]
+                for b, count in enumerate(salary["counts"]) if count > 0]
+    assert sketches[0][0] == salary["min"]
+    assert sketches[-1][-1] == salary["max"]
+    flat = [value for sketch in sketches for value in sketch]
+    assert flat == sorted(flat)
+    
+    print("✓ Quantile sketches verified")
+    return config
+
+def test_correlation():
+    """Test the correlation stage"""
+    print("Testing correlation matrix...")
+    
+    import numpy as np
+    import pandas as pd
+    
+    config = DataExplorerConfig()
+    config.load_csv("test_data/test_data_numerical.csv")
+    config.correlation_chunk_rows = 7000
+    config.add_correlation_matrix(["age", "salary", "height", "weight"])
+    correlation = config._page_config()["correlation"]
+    assert correlation["columns"] == ["age", "salary", "height", "weight"]
+    assert correlation["count"] == 50000
+    
+    # Chunked moment sums agree with pandas on the whole frame
+    df = pd.DataFrame(config.config["data"])[correlation["columns"]]
+    assert np.allclose(correlation["pearson"], df.corr().values, atol=1e-5)
+    assert np.allclose(correlation["spearman"], df.corr(method="spearman").values, atol=1e-5)
+    
+    # String columns and a second matrix are rejected when the chart is added
+    for columns in (["age", "department"], ["age", "height"]):
+        try:
+            config.add_correlation_matrix(columns)
+            assert False, "Should have raised an error"
+        except ValueError as e:
+            print(f"✓ Correctly rejected {columns}: {e}")
+    
+    print("✓ Correlation matrix verified")
+    return config
+
 def test_error_handling():
     """Test error handling"""
     print("Testing error handling...")
@@ -199,6 +593,18 @@ def main():
         test_large_data()
         test_custom_chart_config()
         test_performance()
+        test_summaries()
+        test_column_encoding()
+        test_heatmap_grids()
+        test_category_cube()
+        test_cube_mode()
+        test_bitmap_indexes()
+        test_line_pyramid()
+        test_scatter_rasters()
+        test_angle_columns()
+        test_heavy_hitters()
+        test_quantile_sketches()
+        test_correlation()
         test_error_handling()
         
         print("\n" + "=" * 50)